@@ -1,10 +1,21 @@
 from game import move_left, move_right, move_up, move_down, is_game_over
 import math
 import random
-def evaluate_board(board):
+# Weights of the terms combined by evaluate_board. The defaults reproduce the
+# original hand-written heuristic; tuner.py searches for better values.
+HEURISTIC_WEIGHTS = {"empty": 1.0, "smoothness": 1.0, "corner": 1.0}
+
+def evaluate_board(board, weights=None):
     """
     Calculates the score of the current state of the game.
+
+    Args:
+        board (list): A 2D list representing the game board.
+        weights (dict): Optional weights for the "empty", "smoothness" and "corner"
+            terms. Defaults to HEURISTIC_WEIGHTS.
     """
+    if weights is None:
+        weights = HEURISTIC_WEIGHTS
     tilemax = max_tile(board)
     max_tile_row, max_tile_col = max(((row, col) for row in range(len(board)) for col in range(len(board[row]))), key=lambda cell: board[cell[0]][cell[1]])
 
@@ -15,7 +26,9 @@ def evaluate_board(board):
             cell=board[row][column]
             if cell!=0:
                 smoothness_penalty += math.log(cell,2)*(row+column)
-    return empty_cells(board)*math.log(tilemax,2)- smoothness_penalty -(max_tile_col+max_tile_row)*math.log(tilemax,2)
+    return (weights["empty"]*empty_cells(board)*math.log(tilemax,2)
+            - weights["smoothness"]*smoothness_penalty
+            - weights["corner"]*(max_tile_col+max_tile_row)*math.log(tilemax,2))
 
 def max_tile(board):
     """
@@ -82,7 +95,7 @@ def minimax(board, depth, is_player,nodes_expanded):
 def get_empty_cells(board):
     return [(r, c) for r in range(len(board)) for c in range(len(board[r])) if board[r][c] == 0]
 
-def expectimax(board, depth, is_player,nodes_expanded):
+def expectimax(board, depth, is_player,nodes_expanded, weights=None):
     """
     This function implements the Expectimax algorithm for the 2048 game.
 
@@ -90,13 +103,14 @@ def expectimax(board, depth, is_player,nodes_expanded):
     board (List[List[int]]): The current game board
     depth (int): The current search depth
     is_player (bool): True if it is the player's turn, False if it is the computer's turn
+    weights (dict): Optional evaluate_board weights, passed down to every evaluation
 
     Returns:
     Tuple[float, Optional[Tuple[int, int]]]: A tuple containing the estimated score of the current board state and the best move, if available
     """
     nodes_expanded += 1
     if depth == 0 or is_game_over(board):
-        return evaluate_board(board), None, nodes_expanded
+        return evaluate_board(board, weights), None, nodes_expanded
 
     if is_player:
         # If it is the player's turn, determine the best move by recursively calling expectimax for each possible move,
@@ -106,7 +120,7 @@ def expectimax(board, depth, is_player,nodes_expanded):
         for move in [move_left, move_right, move_up, move_down]:
             new_board = move(board)
             if board != new_board:
-                score, _,nodes_expanded = expectimax(new_board, depth - 1, False, nodes_expanded)
+                score, _,nodes_expanded = expectimax(new_board, depth - 1, False, nodes_expanded, weights)
                 if score > best_score:
                     best_score = score
                     best_move = move
@@ -121,9 +135,9 @@ def expectimax(board, depth, is_player,nodes_expanded):
             return score(board), None
         for cell in empty_cells:
             for value in [2, 4]:
-                new_board = board.copy()
+                new_board = [row[:] for row in board]
                 new_board[cell[0]][cell[1]] = value
-                result, _,nodes_expanded = expectimax(new_board, depth - 1, True, nodes_expanded)
+                result, _,nodes_expanded = expectimax(new_board, depth - 1, True, nodes_expanded, weights)
                 avg_score += result * (0.9 if value == 2 else 0.1)
         avg_score /= num_empty * 2
     
@@ -175,7 +189,7 @@ def expectimax_Epsilon(board, depth, is_player,nodes_expanded):
             return score(board), None, nodes_expanded
         for cell in empty_cells:
             for value in [2, 4]:
-                new_board = board.copy()
+                new_board = [row[:] for row in board]
                 new_board[cell[0]][cell[1]] = value
                 result, _, nodes_expanded = expectimax(new_board, depth - 1, True, nodes_expanded)
                 avg_score += result * (0.9 if value == 2 else 0.1)
@@ -228,7 +242,7 @@ def expectiBetter(board, depth, is_player, nodes_expanded):
             return score(board), None
         for cell in empty_cells:
             for value in [2, 4]:
-                new_board = board.copy()
+                new_board = [row[:] for row in board]
                 new_board[cell[0]][cell[1]] = value
                 nodes_expanded += 1
                 result, _ , nodes_expanded= expectiBetter(new_board, depth - 1, True, nodes_expanded)
@@ -0,0 +1,61 @@
+from packed import PackedGame
+import ai
+import argparse
+import random
+import time
+
+
+def sample_positions(game, count, moves, seed):
+    """
+    Plays random moves from fresh seeded games to collect mid-game packed boards.
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = 0
+        for _ in range(2):
+            board |= 1 << rng.choice(game.empty_cells(board))
+        for _ in range(moves):
+            moved = [game.move(board, direction) for direction in range(4)]
+            moved = [new_board for new_board in moved if new_board != board]
+            if not moved:
+                break
+            board = rng.choice(moved)
+            board |= (1 if rng.random() < 0.9 else 2) << rng.choice(game.empty_cells(board))
+        if not game.is_game_over(board):
+            positions.append(board)
+    return positions
+
+
+def benchmark(sizes=(4, 5, 6), depth=5, positions=20, moves=60, seed=0, compare_lists=False):
+    """
+    Prints the nodes/sec and time per move of the packed expectimax for each board size.
+
+    With compare_lists, the list based ai.expectimax is timed on the same positions too.
+    """
+    print(f"{'size':>6} {'searcher':>10} {'nodes/move':>12} {'ms/move':>10} {'nodes/sec':>12}")
+    for size in sizes:
+        game = PackedGame(size)
+        boards = sample_positions(game, positions, moves, seed)
+        searchers = [("packed", lambda board: game.search(board, depth)[2])]
+        if compare_lists:
+            searchers.append(("list", lambda board: ai.expectimax(game.unpack(board), depth, True, 0)[2]))
+        for name, search in searchers:
+            nodes = 0
+            start = time.perf_counter()
+            for board in boards:
+                nodes += search(board)
+            elapsed = time.perf_counter() - start
+            print(f"{size}x{size:<4} {name:>10} {nodes / len(boards):>12.0f} {1000 * elapsed / len(boards):>10.1f} {nodes / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the expectimax search per board size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 5, 6])
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--moves", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare-lists", action="store_true")
+    args = parser.parse_args()
+    benchmark(args.sizes, args.depth, args.positions, args.moves, args.seed, args.compare_lists)
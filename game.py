@@ -1,4 +1,5 @@
 from ai import *
+import packed
 import tkinter as tk
 import random
 import csv
@@ -120,10 +121,10 @@ class BaseGame2048(tk.Tk):
         board (list): The game board, represented as a 2D list of integers.
         grid_cells (list): A list of Tkinter labels that represent the game cells.
     """
-    def __init__(self):
+    def __init__(self, game_size=4):
         super().__init__()
         self.title('2048 Game')
-        self.game_size = 4  # Default game size
+        self.game_size = game_size
         self.board = initialize_game(self.game_size)
         self.grid_cells = []
         self.init_grid()
@@ -133,7 +134,7 @@ class BaseGame2048(tk.Tk):
         """
         Initializes the game grid by creating Tkinter labels for each cell.
         """
-        background = tk.Frame(self, bg='azure3', width=400, height=400)
+        background = tk.Frame(self, bg='azure3', width=100 * self.game_size, height=100 * self.game_size)
         background.grid()
         for i in range(self.game_size):
             grid_row = []
@@ -335,16 +336,85 @@ class AI_Game2048(BaseGame2048):
             self.game_over()
             self.write_statistics("expectibetter")   
 
+    def auto_play_packed_expectimax(self):
+        """
+        The AI player's turn.
+
+        This method runs expectimax on the packed board representation, which keeps
+        larger boards (5x5, 6x6) playable, and then executes the best move. It then
+        schedules the next move. If the game is over, it displays a "Game Over" message.
+        """
+        if not hasattr(self, 'moves_made'):
+            self.moves_made = 0  # Initialize counter if not already done
+            self.nodes_expanded = 0  # Initialize nodes expanded counter
+            self.packed_game = packed.PackedGame(self.game_size)
+
+        _, best_direction, nodes_expanded = self.packed_game.search(self.packed_game.pack(self.board), depth=5)
+        self.nodes_expanded += nodes_expanded
+        if best_direction is not None:
+            self.moves_made += 1
+            self.board = [move_left, move_right, move_up, move_down][best_direction](self.board)  # Execute the best move
+            self.board = add_new_tile(self.board)
+            self.update_grid_cells()
+
+            if not is_game_over(self.board):
+                self.after(0, self.auto_play_packed_expectimax)  # Schedule the next move after a delay
+            else:
+                self.game_over()
+                self.write_statistics(f"packed_expectimax_{self.game_size}x{self.game_size}")
+        else:
+            self.game_over()
+            self.write_statistics(f"packed_expectimax_{self.game_size}x{self.game_size}")
+
 
 class Auto_Game2048(BaseGame2048):
     """
     A version of the 2048 game with a human player.
 
-    The human player can control the game using the arrow keys.
+    The human player can control the game using the arrow keys. With hints enabled,
+    a background hint engine searches each position while the player thinks and the
+    suggested move is shown below the board.
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, game_size=4, hints=False):
+        super().__init__(game_size)
         self.bind("<Key>", self.key_press)
+        self.hint_engine = None
+        if hints:
+            import hint  # Imported here, as hint -> packed -> ai -> game would be circular at module level
+            self.hint_names = hint.DIRECTION_NAMES
+            self.hint_label = tk.Label(self, text='', font=('Arial', 16, 'bold'))
+            self.hint_label.grid()
+            self.hint_engine = hint.HintEngine(self.game_size)
+            self.hint_engine.start()
+            self.hint_engine.set_position(self.board)
+            self.protocol("WM_DELETE_WINDOW", self.close)
+            self.update_hint()
+
+    def update_hint(self):
+        """
+        Shows the hint engine's current suggestion for the board and schedules the next refresh.
+        """
+        suggestion = self.hint_engine.hint(self.board)
+        if suggestion is None:
+            self.hint_label.configure(text='Hint: thinking...')
+        else:
+            direction, depth = suggestion
+            self.hint_label.configure(text=f'Hint: {self.hint_names[direction]} (depth {depth})')
+        self.hint_update = self.after(50, self.update_hint)
+
+    def stop_hints(self):
+        """
+        Stops the hint engine and the refresh of the hint label.
+        """
+        self.after_cancel(self.hint_update)
+        self.hint_engine.stop()
+
+    def close(self):
+        """
+        Stops the hints and closes the window.
+        """
+        self.stop_hints()
+        self.destroy()
 
     def key_press(self, event):
         """
@@ -367,59 +437,78 @@ class Auto_Game2048(BaseGame2048):
             pass
         self.board = add_new_tile(self.board)
         self.update_grid_cells()
+        if self.hint_engine is not None:
+            self.hint_engine.set_position(self.board)
         if is_game_over(self.board):
-            self.game_over()    
+            self.game_over()
+            if self.hint_engine is not None:
+                self.stop_hints()
+                self.hint_label.configure(text='Hint: no moves')
 
-def start_human_game():
+def start_human_game(game_size=4):
     """
     Starts a new game with a human player.
     """   
-    human_game = Auto_Game2048()
+    human_game = Auto_Game2048(game_size)
     human_game.mainloop()
 
-def start_ai_game_better_faster_stronger():
+def start_human_game_with_hints(game_size=4):
+    """
+    Starts a new game with a human player and the background hint engine.
+    """
+    human_game = Auto_Game2048(game_size, hints=True)
+    human_game.mainloop()
+
+def start_ai_game_better_faster_stronger(game_size=4):
     """
     Starts a new game with an AI player (a star algorithm).
     """
-    ai_game = AI_Game2048()  
+    ai_game = AI_Game2048(game_size)  
     ai_game.auto_play_better_faster_stronger()
 
-def start_ai_game_a_star():
+def start_ai_game_a_star(game_size=4):
     """
     Starts a new game with an AI player (a star algorithm).
     """
-    ai_game = AI_Game2048()  
+    ai_game = AI_Game2048(game_size)  
     ai_game.auto_play_a_star()
 
-def start_ai_game_minimax():
+def start_ai_game_minimax(game_size=4):
     """
     Starts a new game with an AI player (minimax algorithm).
     """
-    ai_game = AI_Game2048()  
+    ai_game = AI_Game2048(game_size)  
     ai_game.auto_play_minimax()
 
-def start_ai_game_expectimax():
+def start_ai_game_expectimax(game_size=4):
     """
     Starts a new game with an AI player (expectimax algorithm).
     """
-    ai_game = AI_Game2048()  
+    ai_game = AI_Game2048(game_size)  
     ai_game.auto_play_expectimax()
 
-def start_ai_game_expectimax_Epsilon():
+def start_ai_game_expectimax_Epsilon(game_size=4):
     """
     Starts a new game with an AI player (expectimax algorithm).
     """
-    ai_game = AI_Game2048()  
+    ai_game = AI_Game2048(game_size)  
     ai_game.auto_play_expectimax_Epsilon()    
 
-def start_ai_game_expectiBetter():
+def start_ai_game_expectiBetter(game_size=4):
     """
     Starts a new game with an AI player (expectimax algorithm).
     """
     for i in range(1):
-        ai_game = AI_Game2048()
+        ai_game = AI_Game2048(game_size)
         ai_game.auto_play_expectiBetter()
 
+def start_ai_game_packed_expectimax(game_size=4):
+    """
+    Starts a new game with an AI player (expectimax on the packed board).
+    """
+    ai_game = AI_Game2048(game_size)
+    ai_game.auto_play_packed_expectimax()
+
 if __name__ == "__main__":
     #start_ai_game_expectiBetter()
     root = tk.Tk()
@@ -437,9 +526,20 @@ if __name__ == "__main__":
 
     tk.Label(root, text="Choose Game Mode:", font=font, bg=bg_color, fg=text_color).pack(pady=20)
 
-    human_button = tk.Button(root, text="Human Player", font=font, command=start_human_game, bg=button_color, fg=text_color)
+    # Board size used by the human and packed expectimax modes; the list based AI
+    # players are too slow beyond 4x4 and always play on the default board
+    tk.Label(root, text="Board size:", font=font, bg=bg_color, fg=text_color).pack()
+    size_var = tk.IntVar(root, value=4)
+    size_menu = tk.OptionMenu(root, size_var, 4, 5, 6)
+    size_menu.configure(font=font, bg=button_color, fg=text_color)
+    size_menu.pack(fill='x', padx=15, pady=5)
+
+    human_button = tk.Button(root, text="Human Player", font=font, command=lambda: start_human_game(size_var.get()), bg=button_color, fg=text_color)
     human_button.pack(fill='x', padx=15, pady=5)
 
+    hints_button = tk.Button(root, text="Human Player (hints)", font=font, command=lambda: start_human_game_with_hints(size_var.get()), bg=button_color, fg=text_color)
+    hints_button.pack(fill='x', padx=15, pady=5)
+
     minimax_button = tk.Button(root, text="AI Player (minimax)", font=font, command=start_ai_game_minimax, bg=button_color, fg=text_color)
     minimax_button.pack(fill='x', padx=15, pady=5)
 
@@ -452,9 +552,12 @@ if __name__ == "__main__":
     b_button = tk.Button(root, text="AI Player (expectiBetter)", font=font, command=start_ai_game_expectiBetter, bg=button_color, fg=text_color)
     b_button.pack(fill='x', padx=15, pady=5)
 
+    packed_button = tk.Button(root, text="AI Player (packed expectimax)", font=font, command=lambda: start_ai_game_packed_expectimax(size_var.get()), bg=button_color, fg=text_color)
+    packed_button.pack(fill='x', padx=15, pady=5)
+
     # Set window size to match the game window and center it on screen
     window_width = 400
-    window_height = 500
+    window_height = 720
     screen_width = root.winfo_screenwidth()
     screen_height = root.winfo_screenheight()
     center_x = int(screen_width/2 - window_width / 2)
@@ -0,0 +1,139 @@
+import packed
+import threading
+
+DIRECTION_NAMES = ["Left", "Right", "Up", "Down"]  # Indexed by packed.LEFT, RIGHT, UP, DOWN
+
+
+class SearchAborted(Exception):
+    """
+    Raised inside a running search when the hint engine gets a new position.
+    """
+
+
+class _InterruptibleGame(packed.PackedGame):
+    """
+    A PackedGame whose search stops as soon as the given event is set.
+    """
+    def __init__(self, size, abort):
+        super().__init__(size)
+        self.abort = abort
+
+    def expectimax(self, packed_board, depth, is_player, nodes_expanded, probability=1.0):
+        if self.abort.is_set():
+            raise SearchAborted()
+        return super().expectimax(packed_board, depth, is_player, nodes_expanded, probability)
+
+
+class HintEngine:
+    """
+    Searches the position shown to the human player in a background thread.
+
+    For every position the worker deepens the search step by step. After each step
+    it also searches the positions that can follow each possible move (every empty
+    cell with a 2 or a 4), so when a key is pressed the hint for the new position
+    is usually already available. Results are kept per position, together with the
+    depth they were searched to.
+
+    Attributes:
+        size (int): The size of the game board.
+        max_depth (int): The deepest search run for a position.
+        speculate (bool): Whether the follow-up positions are searched too.
+        max_cache_size (int): The number of stored hints after which they are dropped.
+    """
+    def __init__(self, size=4, max_depth=7, speculate=True, max_cache_size=500000):
+        self.size = size
+        self.max_depth = max_depth
+        self.speculate = speculate
+        self.max_cache_size = max_cache_size
+        self._abort = threading.Event()
+        self._game = _InterruptibleGame(size, self._abort)
+        self._condition = threading.Condition()
+        self._root = None
+        self._generation = 0
+        self._stopped = False
+        self._results = {}  # packed board -> (best direction, depth)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._abort.set()
+            self._condition.notify()
+
+    def set_position(self, board):
+        """
+        Makes the given 2D list board the position to search, aborting the current search.
+        """
+        root = self._game.pack(board)
+        with self._condition:
+            if root == self._root:
+                return
+            self._root = root
+            self._generation += 1
+            self._abort.set()
+            self._condition.notify()
+
+    def hint(self, board):
+        """
+        Returns the best direction found so far for the given board and its search
+        depth, or None if the position has not been searched yet.
+        """
+        return self._results.get(self._game.pack(board))
+
+    def _run(self):
+        searched_generation = 0
+        while True:
+            with self._condition:
+                while not self._stopped and self._generation == searched_generation:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                root, searched_generation = self._root, self._generation
+                self._abort.clear()
+            try:
+                self._search_position(root)
+            except SearchAborted:
+                pass
+
+    def _search_position(self, root):
+        for depth in range(1, self.max_depth + 1, 2):  # Odd depths end on the player's move
+            self._search(root, depth)
+            if self.speculate:
+                for follow_up in self._follow_ups(root):
+                    self._search(follow_up, depth)
+
+    def _search(self, board, depth):
+        known = self._results.get(board)
+        if known is not None and known[1] >= depth:
+            return
+        # Each search gets its own transposition cache: cached subtrees may have been cut
+        # off by min_probability in a search from another root, and reusing them would
+        # report a hint as searched deeper than it was.
+        self._game.cache = {}
+        if len(self._results) > self.max_cache_size:
+            self._results = {}
+        _, direction, _ = self._game.expectimax(board, depth, is_player=True, nodes_expanded=0)
+        if direction is not None:
+            self._results[board] = (direction, depth)
+
+    def _follow_ups(self, board):
+        """
+        Yields the positions the player can face next, starting with the hinted move
+        and, within a move, with the more likely 2 tiles.
+        """
+        known = self._results.get(board)
+        directions = list(range(4))
+        if known is not None:
+            directions.remove(known[0])
+            directions.insert(0, known[0])
+        for direction in directions:
+            new_board = self._game.move(board, direction)
+            if new_board == board:
+                continue
+            empty_cells = self._game.empty_cells(new_board)
+            for exponent in (1, 2):
+                for shift in empty_cells:
+                    yield new_board | (exponent << shift)
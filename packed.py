@@ -0,0 +1,238 @@
+import ai
+
+CELL_BITS = 5  # Each cell stores the exponent of its tile, so tiles up to 2**31 fit
+CELL_MASK = (1 << CELL_BITS) - 1
+MAX_PACKED_SIZE = 6
+
+LEFT, RIGHT, UP, DOWN = range(4)  # Same order as the move functions tried by the searchers in ai.py
+
+
+class PackedGame:
+    """
+    Game logic for an NxN board packed into a single integer.
+
+    Every cell takes CELL_BITS bits holding log2 of its tile (0 for an empty cell) and
+    row r starts at bit r * size * CELL_BITS. Moves and heuristic terms are looked up
+    per row, and per column for vertical moves, in tables that are filled lazily: a
+    full table has 2**(5 * size) entries, which is far too many for 5x5 and 6x6, while
+    a game only ever reaches a small fraction of the possible rows.
+
+    Attributes:
+        size (int): The size of the game board.
+        min_probability (float): Chance nodes less likely than this are not expanded further.
+        cache (dict): Transposition table of the current search, keyed by (board, depth).
+    """
+    def __init__(self, size=4, min_probability=0.0001):
+        if not 2 <= size <= MAX_PACKED_SIZE:
+            raise ValueError(f"board size must be between 2 and {MAX_PACKED_SIZE}, got {size}")
+        self.size = size
+        self.min_probability = min_probability
+        self.row_bits = size * CELL_BITS
+        self.row_mask = (1 << self.row_bits) - 1
+        self.column_mask = sum(CELL_MASK << (r * self.row_bits) for r in range(size))
+        self.cache = {}
+        self._left = {}
+        self._right = {}
+        self._up = {}
+        self._down = {}
+        self._row_info = {}
+        self._row_shifts = [r * self.row_bits for r in range(size)]
+        column_shifts = [col * CELL_BITS for col in range(size)]
+        self._tables = {
+            LEFT: (self._left, self._fill_left, self.row_mask, self._row_shifts),
+            RIGHT: (self._right, self._fill_right, self.row_mask, self._row_shifts),
+            UP: (self._up, self._fill_up, self.column_mask, column_shifts),
+            DOWN: (self._down, self._fill_down, self.column_mask, column_shifts),
+        }
+
+    def pack(self, board):
+        """
+        Converts a 2D list of tile values into a packed board.
+        """
+        packed = 0
+        for row in range(self.size):
+            for col in range(self.size):
+                tile = board[row][col]
+                if tile:
+                    packed |= (tile.bit_length() - 1) << self._shift(row, col)
+        return packed
+
+    def unpack(self, packed):
+        """
+        Converts a packed board back into a 2D list of tile values.
+        """
+        board = []
+        for row in range(self.size):
+            cells = [(packed >> self._shift(row, col)) & CELL_MASK for col in range(self.size)]
+            board.append([1 << cell if cell else 0 for cell in cells])
+        return board
+
+    def _shift(self, row, col):
+        return row * self.row_bits + col * CELL_BITS
+
+    def _cells(self, row):
+        return [(row >> (col * CELL_BITS)) & CELL_MASK for col in range(self.size)]
+
+    def _join(self, cells):
+        row = 0
+        for col, cell in enumerate(cells):
+            row |= cell << (col * CELL_BITS)
+        return row
+
+    def _move_row_left(self, row):
+        cells = [cell for cell in self._cells(row) if cell]
+        merged = []
+        i = 0
+        while i < len(cells):
+            if i + 1 < len(cells) and cells[i] == cells[i + 1]:
+                merged.append(min(cells[i] + 1, CELL_MASK))
+                i += 2
+            else:
+                merged.append(cells[i])
+                i += 1
+        return self._join(merged + [0] * (self.size - len(merged)))
+
+    def _move_row_right(self, row):
+        reverse = self._join(self._cells(row)[::-1])
+        return self._join(self._cells(self._move_row_left(reverse))[::-1])
+
+    def _row_to_column(self, row):
+        return sum(cell << (r * self.row_bits) for r, cell in enumerate(self._cells(row)))
+
+    def _column_to_row(self, column):
+        return self._join([(column >> shift) & CELL_MASK for shift in self._row_shifts])
+
+    def _fill_left(self, row):
+        result = self._left[row] = self._move_row_left(row)
+        return result
+
+    def _fill_right(self, row):
+        result = self._right[row] = self._move_row_right(row)
+        return result
+
+    def _fill_up(self, column):
+        result = self._up[column] = self._row_to_column(self._move_row_left(self._column_to_row(column)))
+        return result
+
+    def _fill_down(self, column):
+        result = self._down[column] = self._row_to_column(self._move_row_right(self._column_to_row(column)))
+        return result
+
+    def rows(self, packed):
+        return [(packed >> shift) & self.row_mask for shift in self._row_shifts]
+
+    def move(self, packed, direction):
+        """
+        Returns the board after sliding the tiles in the given direction (LEFT, RIGHT, UP or DOWN).
+
+        Columns are looked up in their own tables, keyed by the column masked out of the
+        board in place, so vertical moves never need to transpose the board.
+        """
+        table, fill, mask, shifts = self._tables[direction]
+        result = 0
+        for shift in shifts:
+            line = (packed >> shift) & mask
+            moved = table.get(line)
+            if moved is None:
+                moved = fill(line)
+            result |= moved << shift
+        return result
+
+    def _info(self, row):
+        """
+        Returns the per-row terms used by evaluate and empty_cells:
+        (empty columns, highest exponent, first column holding it, sum of exponents,
+        sum of exponents weighted by their column).
+        """
+        info = self._row_info.get(row)
+        if info is None:
+            cells = self._cells(row)
+            highest = max(cells)
+            info = self._row_info[row] = (
+                [col for col, cell in enumerate(cells) if cell == 0],
+                highest,
+                cells.index(highest),
+                sum(cells),
+                sum(col * cell for col, cell in enumerate(cells)),
+            )
+        return info
+
+    def empty_cells(self, packed):
+        """
+        Returns the bit shifts of all empty cells of the board.
+        """
+        return [r * self.row_bits + col * CELL_BITS
+                for r, row in enumerate(self.rows(packed)) for col in self._info(row)[0]]
+
+    def is_game_over(self, packed):
+        return all(self.move(packed, direction) == packed for direction in range(4))
+
+    def evaluate(self, packed, weights=None):
+        """
+        Packed equivalent of ai.evaluate_board, built from the per-row terms.
+        """
+        if weights is None:
+            weights = ai.HEURISTIC_WEIGHTS
+        empty = smoothness = 0
+        highest = max_row = max_col = -1
+        for r, row in enumerate(self.rows(packed)):
+            empty_cols, row_highest, row_highest_col, exponent_sum, column_sum = self._info(row)
+            empty += len(empty_cols)
+            smoothness += r * exponent_sum + column_sum
+            if row_highest > highest:
+                highest, max_row, max_col = row_highest, r, row_highest_col
+        return (weights["empty"] * empty * highest
+                - weights["smoothness"] * smoothness
+                - weights["corner"] * (max_row + max_col) * highest)
+
+    def search(self, packed, depth):
+        """
+        Runs a fresh expectimax search from the given board.
+
+        Returns:
+            triple: The estimated score, the best direction (or None) and the number of nodes expanded.
+        """
+        self.cache = {}
+        return self.expectimax(packed, depth, is_player=True, nodes_expanded=0)
+
+    def expectimax(self, packed, depth, is_player, nodes_expanded, probability=1.0):
+        """
+        Expectimax over packed boards.
+
+        Unlike ai.expectimax, a chance node weights the 2 and 4 tiles by their real
+        probabilities, stops expanding branches less likely than min_probability and
+        reuses player nodes already searched through the transposition cache.
+
+        Returns:
+            triple: The estimated score, the best direction (or None) and the number of nodes expanded.
+        """
+        nodes_expanded += 1
+        if depth == 0 or probability < self.min_probability:
+            return self.evaluate(packed), None, nodes_expanded
+
+        if is_player:
+            cached = self.cache.get((packed, depth))
+            if cached is not None:
+                return cached[0], cached[1], nodes_expanded
+            best_score = float('-inf')
+            best_move = None
+            for direction in range(4):
+                new_board = self.move(packed, direction)
+                if new_board != packed:
+                    score, _, nodes_expanded = self.expectimax(new_board, depth - 1, False, nodes_expanded, probability)
+                    if score > best_score:
+                        best_score = score
+                        best_move = direction
+            if best_move is None:
+                return self.evaluate(packed), None, nodes_expanded
+            self.cache[(packed, depth)] = (best_score, best_move)
+            return best_score, best_move, nodes_expanded
+        else:
+            empty_cells = self.empty_cells(packed)
+            avg_score = 0
+            for shift in empty_cells:
+                for exponent, chance in ((1, 0.9), (2, 0.1)):
+                    score, _, nodes_expanded = self.expectimax(packed | (exponent << shift), depth - 1, True,
+                                                               nodes_expanded, probability * chance / len(empty_cells))
+                    avg_score += score * chance
+            return avg_score / len(empty_cells), None, nodes_expanded
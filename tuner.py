@@ -0,0 +1,166 @@
+import ai
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+
+# The search only compares evaluations, so scaling all weights together plays the
+# same game. The empty cell weight is therefore fixed to 1 and only the ratios of
+# the other terms to it are tuned.
+TUNED_WEIGHTS = ("smoothness", "corner")
+
+
+def play_headless_game(weights, seed, depth=3, max_moves=None):
+    """
+    Plays one seeded game without a window, using expectimax with the given heuristic weights.
+
+    Args:
+        weights (dict): The weights used by evaluate_board.
+        seed (int): Seed for the random tile placement, so every candidate sees the same games.
+        depth (int): The expectimax search depth.
+        max_moves (int): Optional cap on the number of moves; by default the game is played to the end.
+
+    Returns:
+        int: The game score, i.e. the sum of the values of all tiles created by merges.
+    """
+    rng = random.Random(seed)
+    board = [[0] * 4 for _ in range(4)]
+    spawned_fours = 0
+    moves_made = 0
+    for _ in range(2):  # The game starts with two tiles
+        spawned_fours += _spawn_tile(board, rng)
+    while max_moves is None or moves_made < max_moves:
+        _, best_move, _ = ai.expectimax(board, depth, is_player=True, nodes_expanded=0, weights=weights)
+        if best_move is None:
+            break
+        board = best_move(board)
+        spawned_fours += _spawn_tile(board, rng)
+        moves_made += 1
+    # Creating a tile of value 2**k by merges scored (k - 1) * 2**k points along the way.
+    # Spawned 4 tiles were not merged, so their 4 points are taken off again.
+    score = sum(tile * (tile.bit_length() - 2) for row in board for tile in row if tile)
+    return score - 4 * spawned_fours
+
+
+def _spawn_tile(board, rng):
+    """
+    Places a 2 or a 4 on a random empty cell, like add_new_tile but with the game's own
+    random generator. Returns whether the new tile is a 4.
+    """
+    row, col = rng.choice([(r, c) for r in range(len(board)) for c in range(len(board)) if board[r][c] == 0])
+    board[row][col] = 2 if rng.random() < 0.9 else 4
+    return board[row][col] == 4
+
+
+def _play_task(task):
+    candidate, weights, seed, depth, max_moves = task
+    return candidate, play_headless_game(weights, seed, depth, max_moves)
+
+
+def evaluate_candidates(candidates, seeds, depth, max_moves, processes=None):
+    """
+    Scores each candidate weight set by the mean result of a seeded game per seed.
+
+    The games of all candidates are spread over a pool of worker processes.
+
+    Returns:
+        list: The mean score of each candidate, in the same order as candidates.
+    """
+    tasks = [(i, weights, seed, depth, max_moves) for i, weights in enumerate(candidates) for seed in seeds]
+    totals = [0] * len(candidates)
+    with multiprocessing.Pool(processes) as pool:
+        for candidate, score in pool.imap_unordered(_play_task, tasks):
+            totals[candidate] += score
+    return [total / len(seeds) for total in totals]
+
+
+def full_weights(ratios):
+    """
+    Returns the evaluate weights for the tuned ratios, with the empty cell weight fixed to 1.
+    """
+    return {"empty": 1.0, **ratios}
+
+
+def load_checkpoint(path):
+    """
+    Loads the optimizer state from a checkpoint file, or starts from the default weights.
+    """
+    if os.path.exists(path):
+        with open(path) as file:
+            return json.load(file)
+    defaults = ai.HEURISTIC_WEIGHTS
+    return {
+        "generation": 0,
+        "mean": {name: defaults[name] / defaults["empty"] for name in TUNED_WEIGHTS},
+        "std": {name: 0.5 for name in TUNED_WEIGHTS},
+        "weights": full_weights({name: defaults[name] / defaults["empty"] for name in TUNED_WEIGHTS}),
+        "history": [],
+    }
+
+
+def save_checkpoint(path, state):
+    """
+    Writes the optimizer state to a temporary file and moves it over the checkpoint,
+    so an interrupted run never leaves a half-written checkpoint behind.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(state, file, indent=2)
+    os.replace(tmp_path, path)
+
+
+def tune(checkpoint="tuner_checkpoint.json", generations=10, population=12, elite=3,
+         games=8, depth=3, max_moves=None, processes=None, min_std=0.05):
+    """
+    Tunes the evaluate_board weights with the cross-entropy method.
+
+    Each generation samples a population of weight ratios from a normal distribution,
+    scores them with the same seeded headless games and refits the distribution to
+    the elite candidates. The result is the mean of the final distribution, which
+    averages out the noise of the individual game scores. The state is checkpointed
+    after every generation, so calling tune again with the same checkpoint resumes the run.
+
+    Returns:
+        dict: The optimizer state; "weights" holds the tuned evaluate weights.
+    """
+    state = load_checkpoint(checkpoint)
+    while state["generation"] < generations:
+        rng = random.Random(state["generation"])
+        seeds = [rng.randrange(2**31) for _ in range(games)]
+        candidates = [dict(state["mean"])]
+        while len(candidates) < population:
+            candidates.append({name: max(0.0, rng.gauss(state["mean"][name], state["std"][name])) for name in TUNED_WEIGHTS})
+
+        scores = evaluate_candidates([full_weights(ratios) for ratios in candidates], seeds, depth, max_moves, processes)
+        ranked = sorted(zip(scores, range(len(candidates))), reverse=True)
+        elites = [candidates[i] for _, i in ranked[:elite]]
+        for name in TUNED_WEIGHTS:
+            values = [ratios[name] for ratios in elites]
+            mean = sum(values) / len(values)
+            state["mean"][name] = mean
+            state["std"][name] = max(min_std, math.sqrt(sum((value - mean) ** 2 for value in values) / len(values)))
+
+        state["weights"] = full_weights(state["mean"])
+        state["history"].append({"generation": state["generation"], "mean_candidate_score": scores[0],
+                                 "top_score": ranked[0][0], "population_score": sum(scores) / len(scores)})
+        state["generation"] += 1
+        save_checkpoint(checkpoint, state)
+        print(f"generation {state['generation']}: previous mean scored {scores[0]:.1f}, top {ranked[0][0]:.1f}, weights {state['weights']}")
+    return state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune the evaluate_board heuristic weights.")
+    parser.add_argument("--checkpoint", default="tuner_checkpoint.json")
+    parser.add_argument("--generations", type=int, default=10)
+    parser.add_argument("--population", type=int, default=12)
+    parser.add_argument("--elite", type=int, default=3)
+    parser.add_argument("--games", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--max-moves", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+    tune(args.checkpoint, args.generations, args.population, args.elite,
+         args.games, args.depth, args.max_moves, args.processes)